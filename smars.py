@@ -4,46 +4,174 @@ provides functions and classes for the SMARS quad robot
 based on Kevin McAleers work 
 """
 
+import functools
+import json
 import logging
-from time import sleep
-
-import yaml
+import os
+from array import array
+from time import monotonic, monotonic_ns, sleep
 
 logger = logging.getLogger(__name__)
-from adafruit_motor import servo
-from adafruit_pca9685 import PCA9685
-
-try:
-    import busio
-    from board import SCL, SDA
-except (NotImplementedError):
-    logger.warning("circuitpython not supported on this platform")
-    raise
 
 
 SLEEP_COUNT = 0.1  # time between pwm operations
 SLEEP_SHORT = 0.1
 SLEEP_LONG = 0.1
+MAX_SLEW_TIME = 0.2  # settle time for the worst-case move (~90° at ~2 ms/deg)
+SERVO_DEG_PER_SEC = 500  # SG90-class slew rate, ~0.12 s per 60°
+
+
+# Fast mode, quarters the per-transfer time. On a Raspberry Pi the bus rate
+# is fixed by the kernel; raise it with dtparam=i2c_arm_baudrate=400000 (the
+# PCA9685 tolerates up to 1000000) in /boot/config.txt.
+I2C_FREQUENCY = 400_000
+
+PWM_FREQUENCY = 50  # Hz, the servo frame rate
+
+
+LED0_ON_L = 0x06  # first channel register, start of the LED0..LED15 bank
+
+MIN_PULSE = 750  # µs, matches the adafruit_motor.servo defaults
+MAX_PULSE = 2250
+ACTUATION_RANGE = 180
+
+
+_pca = None
+
+
+def _get_pca():
+    """
+    initialise the I2C bus and the PCA9685 on first use
+    """
+    global _pca
+    if _pca is None:
+        try:
+            import busio
+            from board import SCL, SDA
+            from adafruit_pca9685 import PCA9685
+        except NotImplementedError:
+            logger.warning("circuitpython not supported on this platform")
+            raise
+        try:
+            try:
+                i2c = busio.I2C(SCL, SDA, frequency=I2C_FREQUENCY)
+            except (ValueError, RuntimeError):
+                logger.warning("bus does not support fast mode, falling back to 100 kHz")
+                i2c = busio.I2C(SCL, SDA)
+            pca = PCA9685(i2c)
+            # same rounding as the driver's frequency setter, so a chip we
+            # configured earlier reads back equal and the warm restart skips
+            if pca.prescale_reg != int(25e6 / 4096 / PWM_FREQUENCY + 0.5):
+                pca.frequency = PWM_FREQUENCY
+            pca.mode1_reg |= 0x20  # auto-increment, so one transfer can span registers
+        except Exception:
+            logger.error("failed to initialise PCA9685 servo driver")
+            raise
+        _pca = pca
+    return _pca
+
+
+def _pulse_ticks(angle) -> int:
+    """
+    translate an angle to the 12-bit off-count the PCA9685 expects
+    """
+    pulse = MIN_PULSE + (MAX_PULSE - MIN_PULSE) * angle / ACTUATION_RANGE
+    return int(pulse * PWM_FREQUENCY * 4096 / 1_000_000)
+
+
+_PULSE_TICKS = array('H', (_pulse_ticks(angle) for angle in range(ACTUATION_RANGE + 1)))
+
+_channel_ticks = array('H', [0] * 16)  # last off-count per channel, mirrors the chip
+_pending = None  # set of staged channels while a bulk frame is open
+_state_version = 0  # bumped on every limb move, used to invalidate telemetry
+
+
+_single_write = bytearray(5)  # reused (register, on, on, off_l, off_h) buffer
 
 
-try:
-    i2c = busio.I2C(SCL, SDA)
-    pca = PCA9685(i2c)
-    pca.frequency = 50
-except:
-    logger.error("failed to initialise PCA9685 servo driver") 
-    raise
+def _write_channel(channel: int):
+    """
+    write one channel's staged off-count straight to its registers
+    """
+    ticks = _channel_ticks[channel]
+    buffer = _single_write
+    buffer[0] = LED0_ON_L + 4 * channel
+    buffer[3] = ticks & 0xFF
+    buffer[4] = ticks >> 8
+    with _get_pca().i2c_device as device:
+        device.write(buffer)
+
+
+def _precise_wait(seconds: float):
+    """
+    sleep with a short busy-wait tail so the wake-up does not drift
+    with scheduler jitter
+    """
+    deadline = monotonic_ns() + int(seconds * 1e9)
+    coarse = seconds - 0.002
+    if coarse > 0:
+        sleep(coarse)
+    while monotonic_ns() < deadline:
+        pass
+
+
+CONFIG_FILE = 'config.yaml'
+CONFIG_CACHE = 'config.json'
+CONFIG_CACHE_VERSION = 2  # bump when the derived fields change
+
+
+def _derive_leg_angles(limb: dict):
+    """
+    precompute the body/stretch/swing targets for a leg config entry
+    """
+    if limb['invert']:
+        limb['bodyangle'] = limb['minangle']
+        limb['stretchangle'] = limb['maxangle']
+    else:
+        limb['bodyangle'] = limb['maxangle']
+        limb['stretchangle'] = limb['minangle']
+    limb['swingangle'] = (limb['minangle'] + limb['maxangle']) // 2
+
+
+@functools.lru_cache(maxsize=1)
+def _load_config() -> dict:
+    """
+    load the limb configuration, going through a json snapshot so the
+    slow yaml parse only runs when config.yaml has changed
+    """
+    try:
+        if os.path.getmtime(CONFIG_CACHE) >= os.path.getmtime(CONFIG_FILE):
+            with open(CONFIG_CACHE, 'r') as file:
+                config = json.load(file)
+            if config.pop('cacheversion', None) == CONFIG_CACHE_VERSION:
+                return config
+    except (OSError, ValueError):
+        pass
+    import yaml  # deferred: only needed when the json snapshot is stale
+    with open(CONFIG_FILE, 'r') as file:
+        config = yaml.load(file, Loader=getattr(yaml, 'CSafeLoader', yaml.SafeLoader))
+    for limb in config['legs']:
+        _derive_leg_angles(limb)
+    try:
+        with open(CONFIG_CACHE, 'w') as file:
+            json.dump({'cacheversion': CONFIG_CACHE_VERSION, **config}, file)
+    except OSError:
+        logger.warning("could not write config cache")
+    return config
 
 
 class Limb:
+    __slots__ = ('_name', '_channel', '_min_angle', '_max_angle', '_invert', '_angle',
+                 '_last_move_deg')
+
     def __init__(self, name: str, channel: int, min_angle: int, max_angle: int, invert: bool):
         self._name = name
         self._channel = channel
         self._min_angle = min_angle
         self._max_angle = max_angle
         self._invert = invert
-        self._angle = min_angle
-        self._servo = servo.Servo(pca.channels[channel])
+        self._angle = None  # unknown until the first write, so it always goes out
+        self._last_move_deg = 0
 
 
     @property 
@@ -64,13 +192,28 @@ class Limb:
         moves limb to position
         """
         if self._min_angle <= value <= self._max_angle:
+            if value == self._angle:
+                return
+            global _state_version
+            _state_version += 1
+            self._last_move_deg = ACTUATION_RANGE if self._angle is None else abs(value - self._angle)
             self._angle = value
-            self._servo.angle = value
-            self._current_angle = value
+            _channel_ticks[self._channel] = _PULSE_TICKS[int(value)]
+            if _pending is not None:
+                _pending.add(self._channel)
+            else:
+                _write_channel(self._channel)
         else:
             raise ValueError(f"angle.setter: angle = {value}: outside bounds")
 
 
+    def wait_for_move(self):
+        """
+        sleep just long enough for the last commanded move to finish
+        """
+        sleep(self._last_move_deg / SERVO_DEG_PER_SEC)
+
+
     @property
     def channel(self):
         return self._channel
@@ -82,16 +225,22 @@ class Limb:
     
 
 class Leg(Limb):
-    def __init__(self, name: str, channel: int, min_angle: int, max_angle: int, invert: bool):
+    __slots__ = ('_body_angle', '_stretch_angle', '_swing_angle', '_target_angle')
+
+    def __init__(self, name: str, channel: int, min_angle: int, max_angle: int, invert: bool,
+                 body_angle: int = None, stretch_angle: int = None, swing_angle: int = None):
         super().__init__(name, channel, min_angle, max_angle, invert)
-        if self._invert:
-            self._body_angle = self._min_angle
-            self._stretch_angle = self._max_angle
-            self._swing_angle = (self._min_angle / 2) + self._min_angle
-        else:
-            self._body_angle = self._max_angle
-            self._stretch_angle = self._min_angle
-            self._swing_angle = (self._max_angle - self._min_angle) / 2
+        if body_angle is None:
+            if self._invert:
+                body_angle = self._min_angle
+                stretch_angle = self._max_angle
+            else:
+                body_angle = self._max_angle
+                stretch_angle = self._min_angle
+            swing_angle = (self._min_angle + self._max_angle) // 2
+        self._body_angle = body_angle
+        self._stretch_angle = stretch_angle
+        self._swing_angle = swing_angle
         self._target_angle = self._body_angle
         self.body()
 
@@ -108,7 +257,6 @@ class Leg(Limb):
         set leg to its body position
         """
         self.angle = self._body_angle
-        sleep(SLEEP_COUNT)
 
 
     def swing(self):
@@ -116,7 +264,6 @@ class Leg(Limb):
         sets leg to swing position (45° halfway between body and stretch position
         """
         self.angle = self._swing_angle
-        sleep(SLEEP_COUNT)
     
 
     def stretch(self):
@@ -124,10 +271,11 @@ class Leg(Limb):
         sets leg to stretch position
         """
         self.angle = self._stretch_angle
-        sleep(SLEEP_COUNT)
 
 
 class Foot(Limb):
+    __slots__ = ('_down_angle', '_up_angle')
+
     def __init__(self, name: str, channel: int, min_angle: int, max_angle: int, invert: bool):
         super().__init__(name, channel, min_angle, max_angle, invert)
         if self._invert:
@@ -155,31 +303,88 @@ class SmarsRobot():
     """
     models the robot
     """
+    __slots__ = ('feet', 'legs', '_legs_by_name', '_feet_by_name',
+                 '_foot_right_back', '_foot_right_front', '_foot_left_back', '_foot_left_front',
+                 '_leg_right_back', '_leg_right_front', '_leg_left_back', '_leg_left_front',
+                 '_pairs', '_forward_phases', '_backward_phases', '_current_state',
+                 '_telemetry_cache')
+
     def __init__(self):
-        with open('config.yaml','r') as file:
-            config = yaml.safe_load(file)
-        self.feet = []
-        limbs = config['feet']
-        for limb in limbs:
-            self.feet.append(Foot(name=limb['name'], channel=limb['channel'], min_angle=limb['minangle'], max_angle=limb['maxangle'],invert=limb['invert']))
-        limbs = config['legs']
-        self.legs = []
-        for limb in limbs:
-            self.legs.append(Leg(name=limb['name'], channel=limb['channel'], min_angle=limb['minangle'], max_angle=limb['maxangle'],invert=limb['invert']))
-        logger.debug(f"we have {len(self.legs)} legs and {len(self.feet)} feet")
+        config = _load_config()
+        self.feet = [Foot(limb['name'], limb['channel'], limb['minangle'], limb['maxangle'], limb['invert'])
+                     for limb in config['feet']]
+        self.legs = [Leg(limb['name'], limb['channel'], limb['minangle'], limb['maxangle'], limb['invert'],
+                         limb.get('bodyangle'), limb.get('stretchangle'), limb.get('swingangle'))
+                     for limb in config['legs']]
+        self.feet = tuple(self.feet)
+        self.legs = tuple(self.legs)
+        self._pairs = tuple(zip(self.feet, self.legs))
+        logger.debug("we have %d legs and %d feet", len(self.legs), len(self.feet))
+        self._legs_by_name = {leg.name: leg for leg in self.legs}
+        self._feet_by_name = {foot.name: foot for foot in self.feet}
+        self._foot_right_back = self.get_foot('RIGHT_BACK')
+        self._foot_right_front = self.get_foot('RIGHT_FRONT')
+        self._foot_left_back = self.get_foot('LEFT_BACK')
+        self._foot_left_front = self.get_foot('LEFT_FRONT')
+        self._leg_right_back = self.get_leg('RIGHT_BACK')
+        self._leg_right_front = self.get_leg('RIGHT_FRONT')
+        self._leg_left_back = self.get_leg('LEFT_BACK')
+        self._leg_left_front = self.get_leg('LEFT_FRONT')
+        self._forward_phases = self._compile_phases(self._WALK_FORWARD_PHASES)
+        self._backward_phases = self._compile_phases(self._WALK_BACKWARD_PHASES)
+        self._telemetry_cache = (None, None)
         self._current_state = "stopped"
 
         
+    def _begin_frame(self):
+        """
+        stage limb moves instead of writing each one to the bus
+        """
+        global _pending
+        _pending = set()
+
+
+    def _flush_frame(self):
+        """
+        write all staged channels to the PCA9685 in a single burst
+        """
+        global _pending
+        try:
+            if _pending:
+                first = min(_pending)
+                last = max(_pending)
+                buffer = bytearray([LED0_ON_L + 4 * first])
+                for ticks in _channel_ticks[first:last + 1]:
+                    buffer += bytes((0, 0, ticks & 0xFF, ticks >> 8))
+                with _get_pca().i2c_device as device:
+                    device.write(buffer)
+        finally:
+            # close the frame even on a bus error, otherwise every later
+            # direct angle write stays staged and never reaches the chip
+            _pending = None
+
+
+    @property
+    def telemetry(self) -> list:
+        """
+        current (name, angle) rows for all limbs, rebuilt only after a move
+        """
+        version, rows = self._telemetry_cache
+        if version != _state_version:
+            rows = ([('legs', '')]
+                    + [(leg._name, leg._angle) for leg in self.legs]
+                    + [('feet', '')]
+                    + [(foot._name, foot._angle) for foot in self.feet])
+            self._telemetry_cache = (_state_version, rows)
+        return rows
+
+
     def get_leg(self, name:str)->Leg:
-        for leg in self.legs:
-            if leg.name == name:
-                return leg
+        return self._legs_by_name.get(name)
 
 
     def get_foot(self, name:str)->Foot:
-        for foot in self.feet:
-            if foot.name == name:
-                return foot
+        return self._feet_by_name.get(name)
 
 
     def default(self):
@@ -187,10 +392,13 @@ class SmarsRobot():
         set the limbs to the default position (90°)
         """
         logger.debug("default position")
+        self._begin_frame()
         for leg in self.legs:
             leg.body()
         for foot in self.feet:
             foot.down()
+        self._flush_frame()
+        sleep(MAX_SLEW_TIME)
 
 
     def sit(self):
@@ -198,8 +406,11 @@ class SmarsRobot():
         set each foot to up posistion
         """
         logger.debug("sitting down")
+        self._begin_frame()
         for foot in self.feet:
             foot.up()
+        self._flush_frame()
+        sleep(MAX_SLEW_TIME)
 
 
     def stand(self):
@@ -207,8 +418,11 @@ class SmarsRobot():
         set each foot to down posistion
         """
         logger.debug("standing up")
+        self._begin_frame()
         for foot in self.feet:
             foot.down()
+        self._flush_frame()
+        sleep(MAX_SLEW_TIME)
 
 
     def swing(self):
@@ -216,7 +430,7 @@ class SmarsRobot():
         move legs to swing position, robot forms a giant X shape
         """
         logger.debug("swinging")
-        for foot, leg in zip(self.feet, self.legs):
+        for foot, leg in self._pairs:
             foot.up()
             sleep(SLEEP_COUNT)
             leg.swing()
@@ -231,7 +445,7 @@ class SmarsRobot():
         legs are stretched out towards head and tail
         """
         logger.debug('stretching')
-        for foot, leg in zip(self.feet, self.legs):
+        for foot, leg in self._pairs:
             foot.up()
             sleep(SLEEP_COUNT)
             leg.stretch()
@@ -241,184 +455,114 @@ class SmarsRobot():
 
         
     
+    _WALK_FORWARD_PHASES = (
+        (None, (('_leg_left_front', 'swing'), ('_foot_left_front', 'down'),
+                ('_leg_left_back', 'swing'), ('_foot_left_back', 'down'),
+                ('_leg_right_front', 'body'), ('_foot_right_front', 'down'),
+                ('_leg_right_back', 'body'), ('_foot_right_back', 'down'))),
+        ('_foot_right_front', (('_leg_right_front', 'stretch'), ('_foot_right_front', 'down'))),
+        (None, (('_leg_left_front', 'body'), ('_leg_right_front', 'swing'), ('_leg_right_back', 'swing'))),
+        ('_foot_left_back', (('_leg_left_back', 'body'), ('_foot_left_back', 'down'))),
+        ('_foot_left_front', (('_leg_left_front', 'stretch'), ('_foot_left_front', 'down'))),
+        (None, (('_leg_left_front', 'swing'), ('_leg_left_back', 'swing'),
+                ('_leg_right_front', 'body'), ('_leg_right_back', 'stretch'))),
+        ('_foot_right_back', (('_leg_right_back', 'body'), ('_foot_right_back', 'down'))),
+    )
+
+    _WALK_BACKWARD_PHASES = (
+        (None, (('_leg_left_front', 'body'), ('_foot_left_front', 'down'),
+                ('_leg_left_back', 'body'), ('_foot_left_back', 'down'),
+                ('_leg_right_front', 'swing'), ('_foot_right_front', 'down'),
+                ('_leg_right_back', 'swing'), ('_foot_right_back', 'down'))),
+        ('_foot_left_back', (('_leg_left_back', 'swing'), ('_foot_left_back', 'down'))),
+        (None, (('_leg_left_front', 'swing'), ('_leg_right_front', 'swing'), ('_leg_right_back', 'body'))),
+        ('_foot_right_front', (('_leg_right_front', 'body'), ('_foot_right_front', 'down'))),
+        ('_foot_right_back', (('_leg_right_back', 'swing'), ('_foot_right_back', 'down'))),
+        (None, (('_leg_left_front', 'swing'), ('_leg_right_front', 'swing'), ('_leg_right_back', 'body'))),
+        ('_foot_left_front', (('_leg_left_front', 'body'), ('_foot_left_front', 'down'))),
+    )
+
+
+    def _compile_phases(self, table) -> tuple:
+        """
+        resolve a phase table to bound limb methods once
+        """
+        compiled = []
+        for lift, moves in table:
+            lift_up = getattr(self, lift).up if lift else None
+            compiled.append((lift_up, tuple(getattr(getattr(self, attr), pose) for attr, pose in moves)))
+        return tuple(compiled)
+
+
+    def _run_phase(self, lift_up, moves, deadline: float) -> float:
+        """
+        lift the stepping foot if the phase has one, then burst out the
+        moves; waits aim at an absolute deadline so sleep jitter and bus
+        time do not accumulate over a long walk
+        """
+        if lift_up is not None:
+            lift_up()
+            deadline += SLEEP_SHORT
+            _precise_wait(deadline - monotonic())
+        self._begin_frame()
+        for move in moves:
+            move()
+        self._flush_frame()
+        deadline += MAX_SLEW_TIME
+        remaining = deadline - monotonic()
+        if remaining > 0:
+            sleep(remaining)
+        return deadline
+
+
     def walk_forward(self, steps=1):
         """
         walk forward number of steps.  Default is 1
         """
-        foot_right_back = self.get_foot('RIGHT_BACK')
-        foot_right_front = self.get_foot('RIGHT_FRONT')
-        foot_left_back = self.get_foot('LEFT_BACK')
-        foot_left_front = self.get_foot('LEFT_FRONT')
-        leg_right_back = self.get_leg('RIGHT_BACK')
-        leg_right_front = self.get_leg('RIGHT_FRONT')
-        leg_left_front = self.get_leg('LEFT_FRONT')
-        leg_left_back = self.get_leg('LEFT_BACK')
-
-        def step_forward_phase1():
-            leg_left_front.swing()
-            foot_left_front.down()
-            sleep(SLEEP_SHORT)
-            leg_left_back.swing()
-            foot_left_back.down()
-            sleep(SLEEP_SHORT)
-            leg_right_front.body()
-            foot_right_front.down()
-            sleep(SLEEP_SHORT)
-            leg_right_back.body()
-            foot_right_back.down()
-            sleep(SLEEP_LONG)
-
-        def step_forward_phase2():
-            foot_right_front.up()
-            sleep(SLEEP_SHORT)
-            leg_right_front.stretch()
-            foot_right_front.down()
-            sleep(SLEEP_LONG)
-
-        def step_forward_phase3():
-            leg_left_front.body()
-            leg_right_front.swing()
-            leg_right_back.swing()
-            sleep(SLEEP_LONG)
-
-        def step_forward_phase4():
-            foot_left_back.up()
-            sleep(SLEEP_SHORT)
-            leg_left_back.body()
-            foot_left_back.down()
-            sleep(SLEEP_LONG)
-
-        def step_forward_phase5():
-            foot_left_front.up()
-            sleep(SLEEP_SHORT)
-            leg_left_front.stretch()
-            foot_left_front.down()
-            sleep(SLEEP_LONG)
-
-        def step_forward_phase6():
-            leg_left_front.swing()
-            leg_left_back.swing()
-            leg_right_front.body()
-            leg_right_back.stretch()
-            sleep(SLEEP_LONG)
-
-        def step_forward_phase7():
-            foot_right_back.up()
-            sleep(SLEEP_SHORT)
-            leg_right_back.body()
-            foot_right_back.down()
-            sleep(SLEEP_LONG)
-
+        deadline = monotonic()
         for _ in range(steps):
-            step_forward_phase1()
-            step_forward_phase2()
-            step_forward_phase3()
-            step_forward_phase4()
-            step_forward_phase5()
-            step_forward_phase6()
-            step_forward_phase7()
+            for lift_up, moves in self._forward_phases:
+                deadline = self._run_phase(lift_up, moves, deadline)
         self.swing()
-    
-            
+
+
     def walk_backward(self, steps=1):
         """
         walk backward number of steps.
         if steps not defined take single step
         """
         logger.debug("walking backward")
-
-        foot_right_back = self.get_foot('RIGHT_BACK')
-        foot_right_front = self.get_foot('RIGHT_FRONT')
-        foot_left_back = self.get_foot('LEFT_BACK')
-        foot_left_front = self.get_foot('LEFT_FRONT')
-        leg_right_back = self.get_leg('RIGHT_BACK')
-        leg_right_front = self.get_leg('RIGHT_FRONT')
-        leg_left_front = self.get_leg('LEFT_FRONT')
-        leg_left_back = self.get_leg('LEFT_BACK')
-
-        def step_backward_phase1():
-            leg_left_front.body()
-            foot_left_front.down()
-            sleep(SLEEP_SHORT)
-            leg_left_back.body()
-            foot_left_back.down()
-            sleep(SLEEP_SHORT)
-            leg_right_front.swing()
-            foot_right_front.down()
-            sleep(SLEEP_SHORT)
-            leg_right_back.swing()
-            foot_right_back.down()
-            sleep(SLEEP_LONG)
-            
-        def step_backward_phase2():
-            foot_left_back.up()
-            sleep(SLEEP_SHORT)
-            leg_left_back.swing()
-            foot_left_back.down()
-            sleep(SLEEP_SHORT)
-
-        def step_backward_phase3():
-            leg_left_front.swing()
-            leg_right_front.swing()
-            leg_right_back.body()
-
-        def step_backward_phase4():
-            foot_right_front.up()
-            sleep(SLEEP_SHORT)
-            leg_right_front.body()
-            foot_right_front.down()
-            sleep(SLEEP_SHORT)
-
-        def step_backward_phase5():
-            foot_right_back.up()
-            sleep(SLEEP_SHORT)
-            leg_right_back.swing()
-            foot_right_back.down()
-            sleep(SLEEP_SHORT)
-
-        def step_backward_phase6():
-            leg_left_front.swing()
-            leg_right_front.swing()
-            leg_right_back.body()
-
-        def step_backward_phase7():
-            foot_left_front.up()
-            sleep(SLEEP_SHORT)
-            leg_left_front.body()
-            foot_left_front.down()
-            sleep(SLEEP_SHORT)
-
+        deadline = monotonic()
         for _ in range(steps):
-            step_backward_phase1()
-            step_backward_phase2()
-            step_backward_phase3()
-            step_backward_phase4()
-            step_backward_phase5()
-            step_backward_phase6()
-            step_backward_phase7()
+            for lift_up, moves in self._backward_phases:
+                deadline = self._run_phase(lift_up, moves, deadline)
         self.swing()
 
 
     def turn_left(self):
         logger.debug('turning left')
         self.swing()
-        self.get_leg('LEFT_FRONT').stretch()
-        self.get_leg('LEFT_BACK').body()
-        self.get_leg('RIGHT_FRONT').body()
-        self.get_leg('RIGHT_BACK').stretch()       
-        sleep(SLEEP_COUNT)
+        self._begin_frame()
+        self._leg_left_front.stretch()
+        self._leg_left_back.body()
+        self._leg_right_front.body()
+        self._leg_right_back.stretch()
+        self._flush_frame()
+        sleep(MAX_SLEW_TIME)
         self.swing()
 
 
     def turn_right(self):
         logger.debug('turning right')
         self.swing()
-        self.get_leg('RIGHT_FRONT').stretch()
-        self.get_leg('RIGHT_BACK').body()
-        self.get_leg('LEFT_FRONT').body()
-        self.get_leg('LEFT_BACK').stretch()       
-        sleep(SLEEP_COUNT)
-        self.swing()       
+        self._begin_frame()
+        self._leg_right_front.stretch()
+        self._leg_right_back.body()
+        self._leg_left_front.body()
+        self._leg_left_back.stretch()
+        self._flush_frame()
+        sleep(MAX_SLEW_TIME)
+        self.swing()
 
 
     def wiggle(self, count=1):
@@ -428,18 +572,24 @@ class SmarsRobot():
         logger.debug("wiggling")
 
         self.sit()
-        self.get_foot("LEFT_BACK").up()
-        self.get_foot('RIGHT_BACK').up()
+        self._begin_frame()
+        self._foot_left_back.up()
+        self._foot_right_back.up()
+        self._flush_frame()
         sleep(SLEEP_COUNT)
         LEFT_BACK = self.get_leg('LEFT_BACK')
         RIGHT_BACK = self.get_leg('RIGHT_BACK')
         for _ in range(count):
+            self._begin_frame()
             LEFT_BACK.body()
             RIGHT_BACK.stretch()
-            sleep(SLEEP_COUNT * 5)
+            self._flush_frame()
+            RIGHT_BACK.wait_for_move()
+            self._begin_frame()
             LEFT_BACK.stretch()
             RIGHT_BACK.body()
-            sleep(SLEEP_COUNT * 5)
+            self._flush_frame()
+            RIGHT_BACK.wait_for_move()
         self.stand()
 
     
@@ -455,12 +605,16 @@ class SmarsRobot():
         left_leg = self.get_leg("LEFT_FRONT")
         right_leg = self.get_leg("RIGHT_FRONT")
         for _ in range(count):
+            self._begin_frame()
             left_leg.body()
             right_leg.body()
-            sleep(SLEEP_COUNT * 2)
+            self._flush_frame()
+            right_leg.wait_for_move()
+            self._begin_frame()
             left_leg.stretch()
             right_leg.stretch()
-            sleep(SLEEP_COUNT * 2)
+            self._flush_frame()
+            right_leg.wait_for_move()
         self.stand()
 
 
@@ -7,35 +7,179 @@ Copyright 2019 Kevin McAleer
 Updated 13 June 2021 
 """
 
-from pathlib import Path
+import itertools
+import json
 import logging, logging.config
+import os
+import queue
+import threading
+from collections import deque
 
 
-from flask import Flask, render_template, request, jsonify, flash
-from markupsafe import Markup
+from flask import Flask, render_template, request, Response, abort
 from flask_bootstrap import Bootstrap
 
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
 from smars import SmarsRobot
 import smars as SMARS
 
 
-logging.config.fileConfig('logging_config.ini')
+if not logging.getLogger().handlers:
+    logging.config.dictConfig({
+        'version': 1,
+        'formatters': {
+            'simple': {
+                'format': '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+            },
+        },
+        'handlers': {
+            'console': {
+                'class': 'logging.StreamHandler',
+                'level': 'DEBUG',
+                'formatter': 'simple',
+                'stream': 'ext://sys.stdout',
+            },
+        },
+        'root': {
+            'level': 'DEBUG',
+            'handlers': ['console'],
+        },
+    })
 logger = logging.getLogger(__name__)
 
 APP = Flask(__name__)
 SMARS = SmarsRobot()
 
+_robot_lock = threading.Lock()
+
+_CMDS = {
+    "up": lambda: SMARS.walk_forward(steps=10),
+    "down": lambda: SMARS.walk_backward(steps=10),
+    "left": SMARS.turn_left,
+    "right": SMARS.turn_right,
+    "stand": SMARS.stand,
+    "sit": SMARS.sit,
+    "wiggle": lambda: SMARS.wiggle(1),
+    "clap": lambda: SMARS.clap(1),
+    "home": SMARS.default,
+}
+
+_command_queue = queue.Queue()
+
+
+def _command_worker():
+    """ run queued movement commands one at a time """
+    while True:
+        action = _command_queue.get()
+        with _robot_lock:
+            try:
+                action()
+            except Exception:
+                logger.exception("movement command failed")
+        _command_queue.task_done()
+
+
+threading.Thread(target=_command_worker, daemon=True).start()
+
+
+class CommandHistory:
+    """ bounded record of the commands received by the control api """
+
+    def __init__(self, maxlen=1024):
+        self._history = deque(maxlen=maxlen)
+
+    def append(self, command):
+        """ record a command, evicting the oldest once full """
+        self._history.append(command)
+
+    def clear(self):
+        """ forget all recorded commands """
+        self._history.clear()
+
+    @property
+    def history(self):
+        """ all recorded commands, oldest first """
+        return list(self._history)
+
+    def get_last_ten(self):
+        """ the ten most recent commands, oldest first """
+        start = max(0, len(self._history) - 10)
+        return list(itertools.islice(self._history, start, None))
+
+
+command_history = CommandHistory()
+_HISTORY_ENABLED = os.environ.get('SMARS_HISTORY', '1') == '1'
+
+
+_page_cache = {}
+
+
+def _render_cached(template):
+    """ render a static template once and reuse the result """
+    page = _page_cache.get(template)
+    if page is None:
+        page = _page_cache[template] = render_template(template)
+    return page
+
 
 @APP.route("/")
 def index():
     """ render the main index template """
-    return render_template("index.html")
+    return _render_cached("index.html")
 
 
 @APP.route("/about")
 def about():
     """ returns the about page """
-    return render_template("about.html")
+    return _render_cached("about.html")
+
+
+_telemetry_blob = (None, b'')
+
+
+@APP.route("/telemetry")
+def telemetry():
+    """ returns the current limb angles as json """
+    global _telemetry_blob
+    rows = SMARS.telemetry
+    if msgpack is not None and 'application/msgpack' in request.accept_mimetypes:
+        return Response(msgpack.packb(rows, use_bin_type=True),
+                        mimetype='application/msgpack')
+    if rows is not _telemetry_blob[0]:
+        _telemetry_blob = (rows, json.dumps(rows).encode())
+    return Response(_telemetry_blob[1], mimetype='application/json')
+
+
+def _stream_history(commands):
+    """ yield the command list as json without building one big string """
+    yield '['
+    for index, command in enumerate(commands):
+        yield (',' if index else '') + json.dumps(command)
+    yield ']'
+
+
+_WISE = b'{"result":"you are wise"}'
+_TRY_AGAIN = b'{"result":"try again"}'
+
+
+@APP.route("/background_process")
+def background_process():
+    """ answers the language probe wired up in index.html """
+    lang = request.args.get('proglang')
+    if lang is not None and lang.lower() == 'python':
+        return Response(_WISE, mimetype='application/json')
+    return Response(_TRY_AGAIN, mimetype='application/json')
+
+
+@APP.route("/commandhistory")
+def commandhistory():
+    """ returns the recorded command history as streamed json """
+    return Response(_stream_history(command_history.history),
+                    mimetype='application/json')
 
 
 @APP.route("/controlapi", methods=['GET', 'POST'])
@@ -43,24 +187,13 @@ def controlapi():
     """ control api """
     if request.method == 'POST':
         command = request.values.get('command')
-        if command == "up":
-            SMARS.walk_forward(steps=10)
-        elif command == "down":
-            SMARS.walk_backward(steps=10)
-        elif command == "left":
-            SMARS.turn_left()
-        elif command == "right":
-            SMARS.turn_right()
-        elif command == "stand":
-            SMARS.stand()
-        elif command == "sit":
-            SMARS.sit()
-        elif command == "wiggle":
-            SMARS.wiggle(1)
-        elif command == "clap":
-            SMARS.clap(1)
-        elif command == "home":
-            SMARS.default()
+        action = _CMDS.get(command)
+        if action is None:
+            abort(400)
+        if _HISTORY_ENABLED:
+            command_history.append(command)
+        _command_queue.put(action)
+        return "Ok", 202
     return "Ok"
 
 
@@ -71,7 +204,7 @@ def main():
     APP.host = '0.0.0.0'
     APP.debug = False
     Bootstrap(APP)
-    APP.run(host='0.0.0.0')
+    APP.run(host='0.0.0.0', threaded=True)
 
 
 if __name__ == "__main__":